@@ -0,0 +1,157 @@
+# export.py
+# Columnar export for bracket rows, player stats, features and predictions.
+# Each write appends a new part file under data/export/<kind>/, so runs never
+# rewrite earlier output and loaders read list columns back as real lists.
+
+import os
+import time
+import uuid
+import pandas as pd
+from pathlib import Path
+
+EXPORT_DIR = Path(__file__).resolve().parent / "data" / "export"
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+    except ImportError:
+        raise RuntimeError("pyarrow is required for export (pip install pyarrow)")
+    return pa, pq, ipc
+
+COUNT_COLS = ["Games", "Goals", "Shots", "Saves", "Demos"]
+RATE_COLS = ["Goals/G", "Shots/G", "Saves/G", "Demos/G"]
+
+def _schemas(pa):
+    # Fixed per kind so every part agrees: composeTeam yields floats while an
+    # unresolved roster yields ints, and parts must still concatenate.
+    features = [
+        ("team", pa.string()),
+        ("opponent", pa.string()),
+        ("section", pa.string()),
+        ("round", pa.string()),
+        ("best_of", pa.int32()),
+        ("side", pa.string()),
+        *[(c, pa.int64()) for c in COUNT_COLS],
+        ("Shot %", pa.float64()),
+    ]
+    return {
+        "bracket": pa.schema([
+            ("section", pa.string()),
+            ("round", pa.string()),
+            ("best_of", pa.int32()),
+            ("team1", pa.string()),
+            ("team2", pa.string()),
+            ("team1_url", pa.string()),
+            ("team2_url", pa.string()),
+            ("team1_players", pa.list_(pa.string())),
+            ("team2_players", pa.list_(pa.string())),
+            ("finished", pa.bool_()),
+        ]),
+        "players": pa.schema([
+            ("player_id", pa.string()),
+            ("days", pa.int32()),
+            ("Player", pa.string()),
+            ("Goals", pa.int64()),
+            ("Shots", pa.int64()),
+            ("Saves", pa.int64()),
+            ("Demos", pa.int64()),
+            ("replay_id", pa.string()),
+            ("Date", pa.string()),
+        ]),
+        "features": pa.schema(features),
+        "predictions": pa.schema(features + [
+            ("Team Games", pa.int64()),
+            *[(c, pa.float64()) for c in RATE_COLS],
+            ("ts", pa.string()),
+        ]),
+    }
+
+def _coerce(df, schema, pa):
+    # from_pandas won't turn 3.0 into 3 or "7" into 7 on its own; do it here.
+    df = df.reindex(columns=schema.names)
+    for field in schema:
+        col = df[field.name]
+        if pa.types.is_integer(field.type):
+            df[field.name] = pd.to_numeric(col, errors="coerce").round().astype("Int64")
+        elif pa.types.is_floating(field.type):
+            df[field.name] = pd.to_numeric(col, errors="coerce").astype("float64")
+        elif pa.types.is_boolean(field.type):
+            df[field.name] = col.astype("boolean")
+        elif pa.types.is_string(field.type):
+            df[field.name] = col.astype("string")
+    return df
+
+def toTable(df, kind):
+    pa, _, _ = _pa()
+    schema = _schemas(pa).get(kind)
+    if schema is None:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return pa.Table.from_pandas(_coerce(df, schema, pa), schema=schema, preserve_index=False)
+
+def _parts(path):
+    if not path.exists():
+        return []
+    return sorted(p for p in path.iterdir() if p.suffix in FORMATS.values())
+
+def writeRows(df, kind, fmt="parquet", root=EXPORT_DIR):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r} (choose from {', '.join(FORMATS)})")
+    if df is None or len(df) == 0:
+        return None
+    _, pq, ipc = _pa()
+    table = toTable(pd.DataFrame(df), kind)
+
+    path = Path(root) / kind
+    os.makedirs(path, exist_ok=True)
+    # time-ordered name with a random suffix: concurrent writers never collide
+    out = path / f"part-{time.time_ns()}-{uuid.uuid4().hex[:12]}{FORMATS[fmt]}"
+    tmp = out.with_suffix(out.suffix + ".tmp")
+
+    # write-then-rename so readers never see a half-written part
+    if fmt == "parquet":
+        pq.write_table(table, tmp)
+    else:
+        with ipc.new_file(tmp, table.schema) as w:
+            w.write_table(table)
+    # link fails instead of overwriting if the name somehow exists already
+    os.link(tmp, out)
+    os.unlink(tmp)
+    return out
+
+def loadTable(kind, root=EXPORT_DIR, columns=None):
+    pa, pq, ipc = _pa()
+    schema = _schemas(pa).get(kind)
+    tables = []
+    for p in _parts(Path(root) / kind):
+        if p.suffix == FORMATS["parquet"]:
+            t = pq.read_table(p, columns=columns)
+        else:
+            with pa.memory_map(str(p)) as src:
+                t = ipc.open_file(src).read_all()
+            if columns:
+                t = t.select(columns)
+        if schema is not None:
+            t = t.cast(pa.schema([schema.field(n) for n in t.column_names]))
+        tables.append(t)
+    if not tables:
+        return None
+    if schema is None:
+        return pa.concat_tables(tables, promote_options="default")
+    return pa.concat_tables(tables)
+
+def loadRows(kind, root=EXPORT_DIR, columns=None):
+    t = loadTable(kind, root, columns)
+    if t is None:
+        return pd.DataFrame(columns=columns or [])
+    return t.to_pandas()
+
+def playerFrame(cache):
+    # Flatten a stats.PlayerCache into one row per (player, replay).
+    rows = []
+    for (pid, days), prs in cache.players.items():
+        for r in prs:
+            rows.append({"player_id": pid, "days": days, **r})
+    return pd.DataFrame(rows)
@@ -0,0 +1,248 @@
+# live.py
+# Match-day watch mode: poll Ballchasing for replays uploaded since the last
+# poll, fold them into the cached player rows and re-emit features + per-game
+# projections for every undecided matchup touched by a changed roster. The
+# bracket is re-parsed periodically so advancing teams are picked up.
+
+import json
+import socket
+import threading
+import time
+import pandas as pd
+from datetime import datetime, timezone
+from scrapers import isPlaceholder
+from scrapers.fetch_queue import LIST_TTL
+from stats import PlayerCache, teamFeats, matchRows, foldReplays, AGG_KEYS, RECENT_DAYS
+
+POLL_SECONDS = 15
+RESCAN_SECONDS = 120  # bracket page refresh; Liquipedia asks for gentle page fetch rates
+POLL_COUNT = 20
+SKEW_SECONDS = 60   # re-list a little before the last marker; folding dedupes by replay id
+SEND_TIMEOUT = 2.0  # a socket client that stops reading for this long is dropped
+
+def _rfc3339(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def pollReplays(bc, playerID, since):
+    data = bc.listReplays(**{
+        "player-id": playerID,
+        "created-after": _rfc3339(since),
+        "sort-by": "created",
+        "sort-dir": "desc",
+        "count": POLL_COUNT,
+    })
+    return data.get("list", []) or []
+
+def project(feats, games):
+    # Per-game team rates (the O/U lines a prediction is read against).
+    # feats["Games"] sums each player's replays, so divide by the roster's
+    # distinct replays instead.
+    out = {"Team Games": int(games)}
+    out.update({f"{k}/G": (float(feats[k]) / games if games else 0.0) for k in AGG_KEYS})
+    return pd.Series(out)
+
+def liveMatches(df):
+    # Concrete, undecided matchups only: no TBD/"Winner of" slots, no finished series.
+    if df is None or df.empty:
+        return pd.DataFrame(columns=list(df.columns) if df is not None else [])
+    mask = df["team1"].notna() & df["team2"].notna()
+    mask &= ~df["team1"].map(lambda t: isPlaceholder(str(t)))
+    mask &= ~df["team2"].map(lambda t: isPlaceholder(str(t)))
+    if "finished" in df:
+        mask &= ~df["finished"].fillna(False).astype(bool)
+    return df[mask].reset_index(drop=True)
+
+def _matchKey(m):
+    return (m.get("section"), m.get("round"), m["team1"], m["team2"])
+
+
+def _jsonable(o):
+    return o.item() if hasattr(o, "item") else str(o)
+
+
+class Publisher:
+    """Writes JSON lines to stdout and, optionally, to TCP clients on localhost."""
+
+    def __init__(self, port=None, stdout=True):
+        self.stdout = stdout
+        self.clients = []
+        self.lock = threading.Lock()
+        self.server = None
+        if port:
+            self.server = socket.create_server(("127.0.0.1", port))
+            threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            # bounded sends: a stalled reader must not block the poll loop
+            conn.settimeout(SEND_TIMEOUT)
+            with self.lock:
+                self.clients.append(conn)
+
+    def send(self, payload):
+        line = json.dumps(payload, default=_jsonable)
+        if self.stdout:
+            print(line, flush=True)
+        data = (line + "\n").encode("utf-8")
+        with self.lock:
+            for c in list(self.clients):
+                try:
+                    c.sendall(data)
+                except OSError:  # includes socket.timeout
+                    self.clients.remove(c)
+                    c.close()
+
+    def close(self):
+        if self.server:
+            self.server.close()
+        with self.lock:
+            for c in self.clients:
+                c.close()
+            self.clients.clear()
+
+
+class Watcher:
+    def __init__(self, bc, matches, resolve, idMap, publisher, days=RECENT_DAYS, cache=None,
+                 onRows=None, rescan=None, rescanEvery=RESCAN_SECONDS):
+        self.bc = bc
+        self.resolve = resolve
+        self.idMap = idMap
+        self.publisher = publisher
+        self.days = days
+        self.cache = cache if cache is not None else PlayerCache()
+        self.onRows = onRows  # optional callback(DataFrame), e.g. export.writeRows
+        self.rescan = rescan  # optional callable returning a fresh bracket DataFrame
+        self.rescanEvery = rescanEvery
+        self.pending = []
+        self.logs = []
+        self.feats = {}
+        self.turn = 0
+        self.since = datetime.now(timezone.utc)  # marker for teams not yet polled
+        self.sinceFor = {}  # team -> start of its last successful list call
+        self.lastScan = time.monotonic()
+        self._setMatches(matches)
+
+    def _setMatches(self, df):
+        self.matches = liveMatches(df)
+        self.rosters = {}   # team name -> resolved player IDs
+        for _, m in self.matches.iterrows():
+            for side in ("team1", "team2"):
+                self.rosters[m[side]] = self.resolve(m[side + "_players"], self.idMap)
+        self.teamsOf = {}   # player ID -> teams it appears on
+        for team, ids in self.rosters.items():
+            for pid in ids:
+                self.teamsOf.setdefault(pid, set()).add(team)
+
+    def _teamGames(self, team):
+        rids = set()
+        for pid in self.rosters.get(team, []):
+            rids.update(r["replay_id"] for r in self.cache.players.get((pid, self.days), []))
+        return len(rids)
+
+    def _refresh(self, team):
+        self.feats[team] = teamFeats(self.bc, self.rosters[team], self.logs, self.days, self.cache)
+
+    def _emit(self, m):
+        rows = []
+        for r in matchRows(m, self.feats[m["team1"]], self.feats[m["team2"]]):
+            rows.append(pd.concat([r, project(r, self._teamGames(r["team"]))]))
+        ts = _rfc3339(datetime.now(timezone.utc))
+        self.publisher.send({"ts": ts, "rows": [r.to_dict() for r in rows]})
+        if self.onRows:
+            for r in rows:
+                r["ts"] = ts
+            self.pending.extend(rows)
+
+    def _flush(self):
+        # one export part per prime/poll rather than one per emitted matchup
+        if self.onRows and self.pending:
+            self.onRows(pd.DataFrame(self.pending))
+        self.pending = []
+
+    def prime(self):
+        self.since = datetime.now(timezone.utc)
+        if self.cache.queue:
+            # queued list results may be up to LIST_TTL old; look back that far on the first poll
+            self.since = datetime.fromtimestamp(self.since.timestamp() - LIST_TTL, tz=timezone.utc)
+        for team in self.rosters:
+            self._refresh(team)
+        for _, m in self.matches.iterrows():
+            self._emit(m)
+        self._flush()
+
+    def refreshBracket(self):
+        # Pick up advancing teams, drop decided series; only new matchups are emitted.
+        self.lastScan = time.monotonic()
+        try:
+            df = self.rescan()
+        except Exception as e:
+            self.logs.append(f"Bracket rescan failed: {e}")
+            return 0
+        known = {_matchKey(m) for _, m in self.matches.iterrows()}
+        self._setMatches(df)
+        for team in self.rosters:
+            if team not in self.feats:
+                self._refresh(team)
+        added = 0
+        for _, m in self.matches.iterrows():
+            if _matchKey(m) not in known:
+                self._emit(m)
+                added += 1
+        self._flush()
+        return added
+
+    def poll(self):
+        # One list query per team per cycle: any roster member's list shows the
+        # team's new series games, and folding the replay into every roster
+        # player reuses the cached detail. The queried member rotates each cycle
+        # so a player sitting out doesn't hide uploads.
+        # Each team's marker only advances after its own list call succeeds,
+        # so a 429/5xx streak widens the next lookback instead of dropping games.
+        changed = set()
+        for team, ids in self.rosters.items():
+            if not ids:
+                continue
+            pid = ids[self.turn % len(ids)]
+            started = datetime.now(timezone.utc)
+            last = self.sinceFor.get(team, self.since)
+            since = datetime.fromtimestamp(last.timestamp() - SKEW_SECONDS, tz=timezone.utc)
+            try:
+                listed = pollReplays(self.bc, pid, since)
+            except Exception as e:
+                self.logs.append(f"Poll failed for {pid}: {e}")
+                continue
+            self.sinceFor[team] = started
+            if not listed:
+                continue
+            for p in ids:
+                if foldReplays(self.bc, p, listed, self.logs, self.days, self.cache):
+                    changed.update(self.teamsOf.get(p, {team}))
+        self.turn += 1
+
+        for team in changed:
+            self._refresh(team)
+        touched = 0
+        for _, m in self.matches.iterrows():
+            if m["team1"] in changed or m["team2"] in changed:
+                self._emit(m)
+                touched += 1
+        self._flush()
+        return touched
+
+    def run(self, interval=POLL_SECONDS):
+        self.prime()
+        try:
+            while True:
+                t0 = time.monotonic()
+                if self.rescan and t0 - self.lastScan >= self.rescanEvery:
+                    self.refreshBracket()
+                self.poll()
+                time.sleep(max(0.0, interval - (time.monotonic() - t0)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.publisher.close()
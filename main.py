@@ -6,12 +6,17 @@ import pandas as pd
 from dotenv import load_dotenv
 from scrapers import (
     scrape_playoffs,
+    rescrape_playoffs,
     Ballchasing,
     getH2HStats,
     load_player_id_map,
     resolve_ids,
+    FetchQueue,
+    QUEUE_FILE,
 )
-from stats import buildFeatRows
+from stats import buildFeatRows, PlayerCache
+from export import writeRows, playerFrame
+from live import Watcher, Publisher, POLL_SECONDS, RESCAN_SECONDS
 
 load_dotenv()  # BALLCHASING_API_KEY from .env
 
@@ -72,12 +77,12 @@ def preselect_match(matches: pd.DataFrame, match_arg: str) -> pd.Series | None:
     return found.iloc[0]
 
 
-def run_h2h(row: pd.Series, bc: Ballchasing):
+def run_h2h(row: pd.Series, bc: Ballchasing, queue: FetchQueue | None = None):
     t1, t2 = row["team1"], row["team2"]
     r1, r2 = row["team1_players"], row["team2_players"]
 
     print(f"\n🎯 H2H comparison: {t1} vs {t2}\n")
-    stats, logs = getH2HStats(t1, t2, r1, r2, bc)
+    stats, logs = getH2HStats(t1, t2, r1, r2, bc, queue=queue)
     print(stats if not stats.empty else "No stats found.")
     if logs:
         print("\n📝 Logs:")
@@ -85,22 +90,62 @@ def run_h2h(row: pd.Series, bc: Ballchasing):
             print("-", l)
 
 
-def run_features(row: pd.Series, bc: Ballchasing):
+def run_features(
+    row: pd.Series,
+    bc: Ballchasing,
+    export: str | None = None,
+    queue: FetchQueue | None = None,
+):
     """Build team-level features for just the chosen matchup (both sides)."""
     idMap = load_player_id_map()
     logs = []
-    r1, r2 = buildFeatRows(bc, row, resolve_ids, idMap, logs)
+    cache = PlayerCache(queue)
+    r1, r2 = buildFeatRows(bc, row, resolve_ids, idMap, logs, cache)
     out = pd.DataFrame([r1, r2])
     print(out)
     os.makedirs("data", exist_ok=True)
     out.to_csv("data/features_playoffs_selected.csv", index=False)
     print("\n✅ Saved to data/features_playoffs_selected.csv\n")
+    if export:
+        writeRows(out, "features", export)
+        writeRows(playerFrame(cache), "players", export)
+        print(f"✅ Appended features + player stats ({export}) under data/export/\n")
     if logs:
         print("📝 Logs:")
         for l in logs[:12]:
             print("-", l)
 
 
+def run_watch(
+    bracket: pd.DataFrame,
+    matches: pd.DataFrame,
+    bc: Ballchasing,
+    args,
+    rosters: dict,
+    queue: FetchQueue | None = None,
+):
+    """Stream features for undecided matchups, refreshing as replays land and the bracket advances."""
+    keep = lambda df: df
+    if args.match:
+        row = preselect_match(matches, args.match)
+        if row is not None:
+            # follow these teams through rescans rather than a row index
+            teams = {row["team1"], row["team2"]}
+            keep = lambda df: df[df["team1"].isin(teams) | df["team2"].isin(teams)]
+    onRows = (lambda df: writeRows(df, "predictions", args.export)) if args.export else None
+    watcher = Watcher(
+        bc, keep(bracket), resolve_ids, load_player_id_map(), Publisher(args.port),
+        cache=PlayerCache(queue), onRows=onRows,
+        rescan=lambda: keep(rescrape_playoffs(args.url, rosters)),
+        rescanEvery=args.rescan,
+    )
+    print(
+        f"👀 Watching {len(watcher.matches)} live matchup(s); polling every {args.interval:g}s, "
+        f"bracket refresh every {args.rescan:g}s (Ctrl-C to stop)\n"
+    )
+    watcher.run(args.interval)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="RL PredictorBot — scrape Liquipedia and fetch stats."
@@ -111,24 +156,67 @@ def main():
     )
     parser.add_argument(
         "--mode",
-        choices=["h2h", "features"],
+        choices=["h2h", "features", "watch"],
         default="features",
-        help="Choose 'h2h' for head-to-head comparison or 'features' for feature build (default).",
+        help="Choose 'h2h' for head-to-head comparison, 'features' for feature build (default), or 'watch' to poll for new replays and stream updated features.",
     )
     parser.add_argument(
         "--match",
         help="Preselect a match by index (e.g., 0) or team substring (e.g., 'Karmine'). If omitted, prompts interactively.",
     )
+    parser.add_argument(
+        "--export",
+        choices=["parquet", "arrow"],
+        help="Also append bracket rows, player stats and features to data/export/ in this format.",
+    )
+    parser.add_argument(
+        "--queue",
+        nargs="?",
+        const=str(QUEUE_FILE),
+        help="Route Ballchasing fetches through a persisted job queue (default data/fetch_queue.sqlite) so reruns resume instead of refetching.",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="With --queue: requeue tasks that previously failed (e.g. 4xx) before running.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=POLL_SECONDS,
+        help=f"Watch mode: seconds between Ballchasing polls (default {POLL_SECONDS}).",
+    )
+    parser.add_argument(
+        "--rescan",
+        type=float,
+        default=RESCAN_SECONDS,
+        help=f"Watch mode: seconds between bracket refreshes (default {RESCAN_SECONDS}).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Watch mode: also stream JSON lines to TCP clients on 127.0.0.1:PORT.",
+    )
 
     args = parser.parse_args()
     bc = Ballchasing()
+    queue = FetchQueue(args.queue) if args.queue else None
+    if queue and args.retry_failed:
+        print(f"🔁 Requeued {queue.retryFailed()} failed fetch task(s)")
 
     print(f"\n🔍 Scraping Liquipedia data from: {args.url}\n")
-    df = scrape_playoffs(args.url)
+    rosters = {}
+    df = scrape_playoffs(args.url, rosters)
     print(df.head())
+    if args.export:
+        writeRows(df, "bracket", args.export)
 
     matches = list_matches(df)
-    if matches.empty:
+    if matches.empty and args.mode != "watch":
+        return
+
+    if args.mode == "watch":
+        run_watch(df, matches, bc, args, rosters, queue)
         return
 
     # Preselect if provided; else, prompt.
@@ -144,9 +232,9 @@ def main():
         return
 
     if args.mode == "h2h":
-        run_h2h(row, bc)
+        run_h2h(row, bc, queue)
     else:
-        run_features(row, bc)
+        run_features(row, bc, args.export, queue)
 
 
 if __name__ == "__main__":
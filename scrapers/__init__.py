@@ -1,7 +1,8 @@
-from .playoff_scraper import scrape as scrape_playoffs
+from .playoff_scraper import scrape as scrape_playoffs, rescrape as rescrape_playoffs, isPlaceholder
 from .h2h_ballchasing import (
     Ballchasing,
     getH2HStats,
     load_player_id_map,
     resolve_ids,
-)
\ No newline at end of file
+)
+from .fetch_queue import FetchQueue, QUEUE_FILE
@@ -0,0 +1,205 @@
+# Benchmark: BeautifulSoup/html.parser bracket + roster parsing vs the lxml
+# single-pass parser. Builds a synthetic multi-stage event page (group
+# stages, several playoff brackets, nested round wrappers, filler markup),
+# checks both parsers agree, then times them.
+#
+#   python -m scrapers.bench_bracket [--stages 6] [--matches 16] [--repeat 5]
+
+import argparse, random, time
+from bs4 import BeautifulSoup
+from .playoff_scraper import (
+    parseBrackets, parseRoster, cleanPlayers, getTeamName, getTeamUrl, isPlaceholder,
+)
+
+# Reference: the original BeautifulSoup bracket/roster parser the lxml one replaced.
+
+def extractRoster(team_soup):
+    headers = team_soup.find_all(['h2','h3','h4'])
+    pr_idx = None
+    for i, h in enumerate(headers):
+        txt = h.get_text(" ", strip=True).lower()
+        if 'player roster' in txt:
+            pr_idx = i
+            break
+
+    if pr_idx is not None:
+        for j in range(pr_idx + 1, min(pr_idx + 8, len(headers))):
+            t = headers[j].get_text(" ", strip=True).lower()
+            if 'active' in t:
+                players = []
+                node = headers[j].find_next_sibling()
+                hops = 0
+                while node and hops < 12:
+                    if node.name in ('h2','h3','h4'):
+                        break
+                    if hasattr(node, 'select'):
+                        anchors = node.select('a[title]')
+                        players.extend([a.get('title') or a.get_text(strip=True) for a in anchors])
+                    node = node.find_next_sibling()
+                    hops += 1
+                players = cleanPlayers(players)
+                players = [p for p in players if p.lower() not in {'eversax'}]  # sample coach filter; extend as needed
+                if len(players) >= 3:
+                    return players[:3]
+                if players:
+                    return players
+
+    for sel in [
+        '.roster-card .team-template-text a[title]',
+        '.roster-card .ID a[title]',
+        '.roster-card .player a[title]',
+        '.roster .player a[title]',
+        '.teamcard .team-template-text a[title]',
+        '.infobox-cell-2 a[title]',
+    ]:
+        els = team_soup.select(sel)
+        if els:
+            names = cleanPlayers([e.get('title') or e.get_text(strip=True) for e in els])
+            if names:
+                return names[:3]
+
+    els = team_soup.select('.mw-parser-output a[title]')
+    names = cleanPlayers([e.get('title') for e in els])
+    return names[:3]
+
+
+def roundMap(bracket):
+    mapping = {}
+    columns = bracket.select('.brkts-column, .brkts-round, .brkts-round-wrapper') or [bracket]
+    for col in columns:
+        current = None
+        for child in col.children:
+            if not hasattr(child, 'get'):  # text nodes
+                continue
+            cls = child.get('class', [])
+            if 'brkts-header' in cls:  # this is the label you found
+                current = child.get_text(" ", strip=True)
+            elif 'brkts-match' in cls:
+                mapping[id(child)] = current
+            else:
+                inner = child.select('.brkts-match')
+                for m in inner:
+                    mapping[id(m)] = current
+    return mapping
+
+def nearestSect(n):
+    hd = n.find_previous(['h2', 'h3', 'h4'])
+    if not hd: return "Unknown"
+    hl = hd.select_one('.mw-headline')
+    return (hl.get_text(strip=True) if hl else hd.get_text(strip=True)) or "Unknown"
+
+
+def parseBracketsSoup(soup):
+    rows = []
+    for b in soup.find_all('div', class_='brkts-bracket'):
+        section = nearestSect(b)
+        if 'playoff' not in section.lower():
+            continue
+
+        rmap = roundMap(b)
+
+        for m in b.find_all('div', class_='brkts-match'):
+            ops = m.select('.brkts-opponent-entry')
+            if len(ops) < 2:
+                continue
+
+            t1 = getTeamName(ops[0])
+            t2 = getTeamName(ops[1])
+
+            rows.append({
+                'section': section,
+                'round': rmap.get(id(m)) or "Unknown",
+                'best_of': 7,
+                'team1': t1, 'team2': t2,
+                'team1_url': (None if isPlaceholder(t1) else getTeamUrl(t1)),
+                'team2_url': (None if isPlaceholder(t2) else getTeamUrl(t2)),
+            })
+    return rows
+
+
+# Synthetic pages
+
+TEAMS = ["Team Falcons", "Dignitas", "Team Vitality", "NRG", "Gentle Mates Alpine",
+         "Team Secret", "Karmine Corp", "G2 Stride", "FURIA", "Spacestation"]
+
+def _filler(n):
+    return "".join(
+        f"<p>Note {i} <a href='/rocketleague/Page_{i}' title='Page {i}'>link</a> <span>text</span></p>"
+        for i in range(n)
+    )
+
+def _match(rng):
+    t1, t2 = rng.sample(TEAMS, 2)
+    if rng.random() < 0.1:
+        t2 = "Winner of Match 3"
+    opp = lambda t: (f"<div class='brkts-opponent-entry' aria-label='{t}'>"
+                     f"<span class='name'>{t}</span><div class='score'>{rng.randint(0, 4)}</div></div>")
+    return f"<div class='brkts-match brkts-match-popup-wrapper'>{opp(t1)}{opp(t2)}<div class='brkts-popup'>{_filler(2)}</div></div>"
+
+def _bracket(rng, rounds, matches):
+    cols = []
+    n = matches
+    for r in range(rounds):
+        body = "".join(_match(rng) for _ in range(max(1, n)))
+        col = f"<div class='brkts-round'><div class='brkts-header'>Round {r + 1} <span>(Bo7)</span></div>{body}</div>"
+        cols.append(f"<div class='brkts-round-wrapper'>{col}</div>" if r % 2 else col)
+        n //= 2
+    return f"<div class='brkts-bracket'><div class='brkts-round-body'>{''.join(cols)}</div></div>"
+
+def buildEventPage(stages=6, matches=16, seed=7):
+    rng = random.Random(seed)
+    parts = ["<html><body><div class='mw-parser-output'>"]
+    for s in range(stages):
+        name = "Playoffs" if s % 2 else "Group Stage"
+        parts.append(f"<h2><span class='mw-headline'>{name} {s}</span></h2>{_filler(40)}")
+        for b in range(3):
+            parts.append(f"<h3><span class='mw-headline'>{name} Bracket {b}</span></h3>")
+            parts.append(_bracket(rng, 4, matches))
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+def buildTeamPage(seed=7):
+    rng = random.Random(seed)
+    players = "".join(
+        f"<tr><td class='ID'><a href='/rocketleague/P{i}' title='Player{i}'>Player{i}</a></td></tr>"
+        for i in rng.sample(range(100), 4)
+    )
+    return (f"<html><body><div class='mw-parser-output'>{_filler(200)}"
+            f"<h2>Player Roster</h2><h3>Active</h3><table>{players}</table>"
+            f"<h3>Former</h3>{_filler(200)}</div></body></html>")
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark bs4 vs lxml bracket parsing.")
+    ap.add_argument("--stages", type=int, default=6)
+    ap.add_argument("--matches", type=int, default=16)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    page = buildEventPage(args.stages, args.matches)
+    team = buildTeamPage()
+    print(f"event page: {len(page) / 1e6:.2f} MB, team page: {len(team) / 1e3:.0f} KB")
+
+    for label, old, new in (
+        ("bracket", lambda: parseBracketsSoup(BeautifulSoup(page, "html.parser")), lambda: parseBrackets(page)),
+        ("roster", lambda: extractRoster(BeautifulSoup(team, "html.parser")), lambda: parseRoster(team)),
+    ):
+        t_old, r_old = _time(old, args.repeat)
+        t_new, r_new = _time(new, args.repeat)
+        if label == "bracket":
+            # the lxml parser adds fields the reference never had (e.g. 'finished')
+            r_new = [{k: r[k] for k in r_old[0]} for r in r_new] if r_old else r_new
+        assert r_old == r_new, f"{label}: parsers disagree"
+        n = len(r_old)
+        print(f"{label:8s} bs4 {t_old * 1e3:8.1f} ms | lxml {t_new * 1e3:7.1f} ms | "
+              f"{t_old / t_new:5.1f}x  ({n} {'rows' if label == 'bracket' else 'players'})")
+
+if __name__ == "__main__":
+    main()
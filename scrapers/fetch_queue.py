@@ -0,0 +1,236 @@
+import json, random, sqlite3, time
+from pathlib import Path
+
+import requests
+
+
+QUEUE_FILE = Path(__file__).resolve().parents[1] / "data" / "fetch_queue.sqlite"
+
+# pending -> running -> done | exhausted | failed. running rows older than
+# LEASE are treated as abandoned (crash / Ctrl-C) and picked up again;
+# exhausted rows (429/5xx/network past maxAttempts) are requeued on the next
+# open, failed rows (other 4xx) stay failed until retryFailed().
+LEASE = 600
+
+# Replay lists change as new games are uploaded; details and groups don't.
+LIST_TTL = 900
+TTL = {"list": LIST_TTL}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    key        TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    arg        TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    next_at    REAL NOT NULL DEFAULT 0,
+    claimed_at REAL,
+    error      TEXT,
+    result     TEXT,
+    fetched_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_due ON tasks (status, next_at);
+"""
+
+def _taskKey(kind, arg):
+    if isinstance(arg, dict):
+        arg = json.dumps(arg, sort_keys=True)
+    return f"{kind}:{arg}", arg
+
+
+class FetchQueue:
+    """Persisted table of Ballchasing list/detail fetches with retry + resume."""
+
+    def __init__(self, path=QUEUE_FILE, maxAttempts=6, baseDelay=2.0, maxDelay=300.0, resume=True):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), isolation_level=None, timeout=30)
+        self.db.executescript(_SCHEMA)
+        cols = {r[1] for r in self.db.execute("PRAGMA table_info(tasks)")}
+        if "fetched_at" not in cols:
+            self.db.execute("ALTER TABLE tasks ADD COLUMN fetched_at REAL")
+        self.maxAttempts = maxAttempts
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        if resume:
+            # single-process runs: anything left 'running' was cut off by the last exit
+            self.db.execute("UPDATE tasks SET status = 'pending' WHERE status = 'running'")
+            self.db.execute(
+                "UPDATE tasks SET status = 'pending', attempts = 0, next_at = 0 WHERE status = 'exhausted'"
+            )
+
+    def close(self):
+        self.db.close()
+
+    # Task table
+
+    def _cutoff(self, kind):
+        ttl = TTL.get(kind)
+        return time.time() - ttl if ttl else None
+
+    def enqueue(self, kind, arg):
+        key, arg = _taskKey(kind, arg)
+        self.db.execute(
+            "INSERT OR IGNORE INTO tasks (key, kind, arg) VALUES (?, ?, ?)",
+            (key, kind, str(arg)),
+        )
+        cutoff = self._cutoff(kind)
+        if cutoff is not None:
+            # expired results go back to pending so the next work() refreshes them
+            self.db.execute(
+                "UPDATE tasks SET status = 'pending', attempts = 0, next_at = 0 "
+                "WHERE key = ? AND status = 'done' AND COALESCE(fetched_at, 0) < ?",
+                (key, cutoff),
+            )
+        return key
+
+    def result(self, kind, arg):
+        key, _ = _taskKey(kind, arg)
+        row = self.db.execute(
+            "SELECT result, fetched_at FROM tasks WHERE key = ? AND status = 'done'", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        cutoff = self._cutoff(kind)
+        if cutoff is not None and (row[1] or 0) < cutoff:
+            return None
+        return json.loads(row[0])
+
+    def status(self, kind, arg):
+        key, _ = _taskKey(kind, arg)
+        row = self.db.execute("SELECT status, error FROM tasks WHERE key = ?", (key,)).fetchone()
+        return row if row else (None, None)
+
+    def counts(self):
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+
+    def _claim(self, keys=None):
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            q = ("SELECT key, kind, arg, attempts FROM tasks "
+                 "WHERE ((status = 'pending' AND next_at <= ?) "
+                 "    OR (status = 'running' AND claimed_at <= ?))")
+            params = [now, now - LEASE]
+            if keys:
+                q += f" AND key IN ({','.join('?' * len(keys))})"
+                params += list(keys)
+            row = self.db.execute(q + " ORDER BY next_at LIMIT 1", params).fetchone()
+            if row:
+                self.db.execute(
+                    "UPDATE tasks SET status = 'running', claimed_at = ? WHERE key = ?",
+                    (now, row[0]),
+                )
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return row
+
+    def _nextDue(self, keys=None):
+        q = ("SELECT MIN(CASE WHEN status = 'running' THEN claimed_at + ? ELSE next_at END) "
+             "FROM tasks WHERE status IN ('pending', 'running')")
+        params = [LEASE]
+        if keys:
+            q += f" AND key IN ({','.join('?' * len(keys))})"
+            params += list(keys)
+        return self.db.execute(q, params).fetchone()[0]
+
+    # Workers
+
+    def _execute(self, bc, kind, arg):
+        if kind == "list":
+            return bc.listReplays(**json.loads(arg))
+        if kind == "detail":
+            return bc.getReplay(arg)
+        if kind == "group":
+            return bc.getGroup(arg)
+        raise ValueError(f"Unknown fetch kind {kind!r}")
+
+    def _backoff(self, attempts, err):
+        delay = min(self.maxDelay, self.baseDelay * 2 ** (attempts - 1))
+        delay *= 0.5 + random.random()
+        resp = getattr(err, "response", None)
+        if resp is not None and resp.status_code == 429:
+            try:
+                delay = max(delay, float(resp.headers.get("Retry-After", 0)))
+            except ValueError:
+                pass
+        return delay
+
+    def _retryable(self, err):
+        resp = getattr(err, "response", None)
+        if resp is None:
+            return isinstance(err, (requests.RequestException, OSError))
+        return resp.status_code == 429 or resp.status_code >= 500
+
+    def work(self, bc, logs=None, keys=None):
+        """Run due tasks until none are left (sleeping through backoff)."""
+        done = 0
+        while True:
+            row = self._claim(keys)
+            if row is None:
+                due = self._nextDue(keys)
+                if due is None:
+                    return done
+                time.sleep(max(0.05, due - time.time()))
+                continue
+
+            key, kind, arg, attempts = row
+            attempts += 1
+            try:
+                res = self._execute(bc, kind, arg)
+            except KeyboardInterrupt:
+                self.db.execute("UPDATE tasks SET status = 'pending' WHERE key = ?", (key,))
+                raise
+            except Exception as e:
+                if self._retryable(e) and attempts < self.maxAttempts:
+                    wait = self._backoff(attempts, e)
+                    self.db.execute(
+                        "UPDATE tasks SET status = 'pending', attempts = ?, next_at = ?, error = ? WHERE key = ?",
+                        (attempts, time.time() + wait, str(e), key),
+                    )
+                    if logs is not None:
+                        logs.append(f"{key} failed ({e}); retry {attempts} in {wait:.1f}s")
+                elif self._retryable(e):
+                    self.db.execute(
+                        "UPDATE tasks SET status = 'exhausted', attempts = ?, error = ? WHERE key = ?",
+                        (attempts, str(e), key),
+                    )
+                    if logs is not None:
+                        logs.append(f"{key} gave up after {attempts} attempts ({e}); requeued next run")
+                else:
+                    self.db.execute(
+                        "UPDATE tasks SET status = 'failed', attempts = ?, error = ? WHERE key = ?",
+                        (attempts, str(e), key),
+                    )
+                    if logs is not None:
+                        logs.append(f"{key} failed permanently: {e}")
+                continue
+
+            # guarded so a late duplicate worker never overwrites a finished row
+            self.db.execute(
+                "UPDATE tasks SET status = 'done', attempts = ?, error = NULL, result = ?, fetched_at = ? "
+                "WHERE key = ? AND status = 'running'",
+                (attempts, json.dumps(res), time.time(), key),
+            )
+            done += 1
+
+    def fetch(self, bc, kind, arg, logs=None):
+        """Fetch one item through the queue; reuses a stored result if present."""
+        res = self.result(kind, arg)
+        if res is not None:
+            return res
+        key = self.enqueue(kind, arg)
+        self.work(bc, logs, keys=[key])
+        res = self.result(kind, arg)
+        if res is None:
+            _, err = self.status(kind, arg)
+            raise RuntimeError(f"{key} failed: {err}")
+        return res
+
+    def retryFailed(self):
+        cur = self.db.execute(
+            "UPDATE tasks SET status = 'pending', attempts = 0, next_at = 0 "
+            "WHERE status IN ('failed', 'exhausted')"
+        )
+        return cur.rowcount
@@ -201,7 +201,7 @@ def aggregatePlayers(rows):
     return g[["Player", "Games", "Goals", "Shots", "Shot %", "Saves", "Demos"]].sort_values(["Games", "Shot %"], ascending=[False, False])
 
 
-def getH2HStats(t1, t2, r1, r2, bc: Ballchasing, limit: int=6, fallback: int=30):
+def getH2HStats(t1, t2, r1, r2, bc: Ballchasing, limit: int=6, fallback: int=30, queue=None):
     logs = []
     session = requests.Session()
     h2h = parseH2H(t1, t2)
@@ -224,7 +224,7 @@ def getH2HStats(t1, t2, r1, r2, bc: Ballchasing, limit: int=6, fallback: int=30)
                 replayIDs.add(rid)
             elif kind == "group":
                 try:
-                    g = bc.getGroup(rid)
+                    g = queue.fetch(bc, "group", rid) if queue else bc.getGroup(rid)
                     for it in g.get("replays", []) or []:
                         if "id" in it:
                             replayIDs.add(it["id"])
@@ -239,12 +239,13 @@ def getH2HStats(t1, t2, r1, r2, bc: Ballchasing, limit: int=6, fallback: int=30)
 
         for name in set((r1 or []) + (r2 or [])):
             try:
-                data = bc.listReplays(**{
+                params = {
                     "player-name": name,
                     "sort-by": "date",
                     "order": "desc",
                     "count": 25, "page": 0,
-                })
+                }
+                data = queue.fetch(bc, "list", params) if queue else bc.listReplays(**params)
                 by_name.extend(data.get("list", []))
                 time.sleep(0.2)
             except Exception as e:
@@ -255,7 +256,7 @@ def getH2HStats(t1, t2, r1, r2, bc: Ballchasing, limit: int=6, fallback: int=30)
 
         for it in by_name:
             try:
-                d = bc.getReplay(it["id"])
+                d = queue.fetch(bc, "detail", it["id"]) if queue else bc.getReplay(it["id"])
             except Exception as e:
                 logs.append(f"BC detail error {it.get('id')}: {e}")
                 continue
@@ -270,7 +271,7 @@ def getH2HStats(t1, t2, r1, r2, bc: Ballchasing, limit: int=6, fallback: int=30)
 
     for rid in replayIDs:
         try:
-            d = bc.getReplay(rid)
+            d = queue.fetch(bc, "detail", rid) if queue else bc.getReplay(rid)
         except Exception as e:
             logs.append(f"Replay {rid} fetch failed: {e}")
             continue
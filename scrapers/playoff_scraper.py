@@ -1,6 +1,6 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxhtml
 from urllib.parse import urljoin, quote
 import time, re, requests
 import pandas as pd
@@ -33,12 +33,11 @@ def getTeamUrl(teamURL):
 def isPlaceholder(name):
     return not name or bool(PLACEHOLDER.search(name.strip()))
 
-def fetchHTML(url, session=None):
+def fetchPage(url, session=None):
     sess = session or requests.Session()
     r = sess.get(url, headers=HEADERS, timeout=20)
     r.raise_for_status()
-    return BeautifulSoup(r.text, "html.parser")
-    
+    return r.text  # decoded with the HTTP charset, as the old bs4 path did
 
 def cleanPlayers(names):
     # filter obvious non-players and staff-y entries
@@ -56,103 +55,83 @@ def cleanPlayers(names):
             uniq.append(n); seen.add(n)
     return uniq
 
-def extractRoster(team_soup):
-    headers = team_soup.find_all(['h2','h3','h4'])
-    pr_idx = None
-    for i, h in enumerate(headers):
-        txt = h.get_text(" ", strip=True).lower()
-        if 'player roster' in txt:
-            pr_idx = i
-            break
-
-    if pr_idx is not None:
-        for j in range(pr_idx + 1, min(pr_idx + 8, len(headers))):
-            t = headers[j].get_text(" ", strip=True).lower()
-            if 'active' in t:
-                players = []
-                node = headers[j].find_next_sibling()
-                hops = 0
-                while node and hops < 12:
-                    if node.name in ('h2','h3','h4'):
-                        break
-                    if hasattr(node, 'select'):
-                        anchors = node.select('a[title]')
-                        players.extend([a.get('title') or a.get_text(strip=True) for a in anchors])
-                    node = node.find_next_sibling()
-                    hops += 1
-                players = cleanPlayers(players)
-                players = [p for p in players if p.lower() not in {'eversax'}]  # sample coach filter; extend as needed
-                if len(players) >= 3:
-                    return players[:3]
-                if players:
-                    return players
-
-    for sel in [
-        '.roster-card .team-template-text a[title]',
-        '.roster-card .ID a[title]',
-        '.roster-card .player a[title]',
-        '.roster .player a[title]',
-        '.teamcard .team-template-text a[title]',
-        '.infobox-cell-2 a[title]',
-    ]:
-        els = team_soup.select(sel)
-        if els:
-            names = cleanPlayers([e.get('title') or e.get_text(strip=True) for e in els])
-            if names:
-                return names[:3]
+def _cls(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+HEADINGS = {'h2', 'h3', 'h4'}
+COLUMN_CLS = {'brkts-column', 'brkts-round', 'brkts-round-wrapper'}
+X_HAS_COLUMN = etree.XPath(
+    f".//*[{_cls('brkts-column')} or {_cls('brkts-round')} or {_cls('brkts-round-wrapper')}]"
+)
+X_OPPONENTS = etree.XPath(f".//*[{_cls('brkts-opponent-entry')}]")
+X_HEADLINE = etree.XPath(f".//*[{_cls('mw-headline')}]")
+X_SCORE = etree.XPath(f".//*[{_cls('brkts-opponent-score-inner')}]")
+X_HAS_WINNER = etree.XPath(f"boolean(.//*[{_cls('brkts-opponent-win')}])")
+
+def _text(el, sep=""):
+    return sep.join(t.strip() for t in el.itertext() if t.strip())
+
+def _headingText(hd):
+    hl = X_HEADLINE(hd)
+    return (_text(hl[0]) if hl else _text(hd)) or "Unknown"
+
+def _finished(match, ops, best_of=7):
+    # a decided series either marks a winner or has a side at the clinching score
+    if X_HAS_WINNER(match):
+        return True
+    need = best_of // 2 + 1
+    for op in ops[:2]:
+        sc = X_SCORE(op)
+        txt = _text(sc[0]) if sc else ""
+        if txt.isdigit() and int(txt) >= need:
+            return True
+    return False
+
+def parseBrackets(page):
+    """Sections, rounds and matchups from one walk over the lxml tree."""
+    doc = lxhtml.fromstring(page) if isinstance(page, (str, bytes)) else page
+    rows = []
+    section = bracketSect = "Unknown"
+    bracket = None    # bracket element currently being walked (playoff only)
+    frames = []       # [column element, current round label]
 
-    els = team_soup.select('.mw-parser-output a[title]')
-    names = cleanPlayers([e.get('title') for e in els])
-    return names[:3]
+    for event, el in etree.iterwalk(doc, events=("start", "end")):
+        if not isinstance(el.tag, str):
+            continue
 
+        if event == "end":
+            if frames and frames[-1][0] is el:
+                frames.pop()
+            if el is bracket:
+                bracket = None
+            continue
 
-def roundMap(bracket):
-    mapping = {}
-    columns = bracket.select('.brkts-column, .brkts-round, .brkts-round-wrapper') or [bracket]
-    for col in columns:
-        current = None
-        for child in col.children:
-            if not hasattr(child, 'get'):  # text nodes
-                continue
-            cls = child.get('class', [])
-            if 'brkts-header' in cls:  # this is the label you found
-                current = child.get_text(" ", strip=True)
-            elif 'brkts-match' in cls:
-                mapping[id(child)] = current
-            else:
-                inner = child.select('.brkts-match')
-                for m in inner:
-                    mapping[id(m)] = current
-    return mapping
-
-def nearestSect(n):
-    hd = n.find_previous(['h2', 'h3', 'h4'])
-    if not hd: return "Unknown"
-    hl = hd.select_one('.mw-headline')
-    return (hl.get_text(strip=True) if hl else hd.get_text(strip=True)) or "Unknown"
-
-
-def scrape(URL):
+        cls = el.get('class')
+        cls = set(cls.split()) if cls else ()
 
-    opts = Options()
-    opts.add_argument("--headless=new")
-    driver = webdriver.Chrome(options=opts)
-    driver.get(URL)
-    time.sleep(5)
+        if el.tag in HEADINGS:
+            section = _headingText(el)
 
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    driver.quit()
+        if bracket is None:
+            if el.tag == 'div' and 'brkts-bracket' in cls and 'playoff' in section.lower():
+                bracket, bracketSect = el, section
+                frames = []
+                if not X_HAS_COLUMN(el):
+                    frames.append([el, None])
+            continue
 
-    rows = []
-    for b in soup.find_all('div', class_='brkts-bracket'):
-        section = nearestSect(b)
-        if 'playoff' not in section.lower():
+        # round labels only come from headers that sit directly in a column
+        if 'brkts-header' in cls:
+            if frames and el.getparent() is frames[-1][0]:
+                frames[-1][1] = _text(el, " ")
             continue
 
-        rmap = roundMap(b)
+        if cls and not COLUMN_CLS.isdisjoint(cls):
+            frames.append([el, None])
+            continue
 
-        for m in b.find_all('div', class_='brkts-match'):
-            ops = m.select('.brkts-opponent-entry')
+        if el.tag == 'div' and 'brkts-match' in cls:
+            ops = X_OPPONENTS(el)
             if len(ops) < 2:
                 continue
 
@@ -160,16 +139,74 @@ def scrape(URL):
             t2 = getTeamName(ops[1])
 
             rows.append({
-                'section': section,
-                'round': rmap.get(id(m)) or "Unknown",
+                'section': bracketSect,
+                'round': (frames[-1][1] if frames else None) or "Unknown",
                 'best_of': 7,
                 'team1': t1, 'team2': t2,
                 'team1_url': (None if isPlaceholder(t1) else getTeamUrl(t1)),
                 'team2_url': (None if isPlaceholder(t2) else getTeamUrl(t2)),
+                'finished': _finished(el, ops),
             })
+    return rows
+
+X_HEADERS = etree.XPath("//h2 | //h3 | //h4")
+X_TITLED = etree.XPath(".//a[@title]")
+X_ROSTER_FALLBACKS = [etree.XPath(x) for x in (
+    f"//*[{_cls('roster-card')}]//*[{_cls('team-template-text')}]//a[@title]",
+    f"//*[{_cls('roster-card')}]//*[{_cls('ID')}]//a[@title]",
+    f"//*[{_cls('roster-card')}]//*[{_cls('player')}]//a[@title]",
+    f"//*[{_cls('roster')}]//*[{_cls('player')}]//a[@title]",
+    f"//*[{_cls('teamcard')}]//*[{_cls('team-template-text')}]//a[@title]",
+    f"//*[{_cls('infobox-cell-2')}]//a[@title]",
+)]
+X_PARSER_OUTPUT = etree.XPath(f"//*[{_cls('mw-parser-output')}]//a[@title]")
+
+def _nextTag(el):
+    el = el.getnext()
+    while el is not None and not isinstance(el.tag, str):
+        el = el.getnext()
+    return el
+
+def parseRoster(page):
+    """Active roster from a team page: roster headers first, then fallback selectors."""
+    doc = lxhtml.fromstring(page) if isinstance(page, (str, bytes)) else page
+    headers = X_HEADERS(doc)
+    texts = [_text(h, " ").lower() for h in headers]
+    pr_idx = next((i for i, t in enumerate(texts) if 'player roster' in t), None)
 
-    sess = requests.Session()
-    cache = {}
+    if pr_idx is not None:
+        for j in range(pr_idx + 1, min(pr_idx + 8, len(headers))):
+            if 'active' in texts[j]:
+                players = []
+                node = _nextTag(headers[j])
+                hops = 0
+                while node is not None and hops < 12:
+                    if node.tag in HEADINGS:
+                        break
+                    players.extend([a.get('title') or _text(a) for a in X_TITLED(node)])
+                    node = _nextTag(node)
+                    hops += 1
+                players = cleanPlayers(players)
+                players = [p for p in players if p.lower() not in {'eversax'}]  # sample coach filter; extend as needed
+                if len(players) >= 3:
+                    return players[:3]
+                if players:
+                    return players
+
+    for sel in X_ROSTER_FALLBACKS:
+        els = sel(doc)
+        if els:
+            names = cleanPlayers([e.get('title') or _text(e) for e in els])
+            if names:
+                return names[:3]
+
+    names = cleanPlayers([e.get('title') for e in X_PARSER_OUTPUT(doc)])
+    return names[:3]
+
+
+def attachRosters(rows, cache, session=None):
+    # cache: team url -> roster, reused across rescans so only new teams are fetched
+    sess = session or requests.Session()
     for r in rows:
         for side in ('team1','team2'):
             url = r[side + '_url']
@@ -178,14 +215,34 @@ def scrape(URL):
                 continue
             if url not in cache:
                 try:
-                    ts = fetchHTML(url, session=sess)
-                    cache[url] = extractRoster(ts)
+                    cache[url] = parseRoster(fetchPage(url, session=sess))
                     time.sleep(0.4)
                 except Exception:
                     cache[url] = []
             r[side + '_players'] = cache[url]
+    return rows
+
+
+def scrape(URL, cache=None):
+
+    opts = Options()
+    opts.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=opts)
+    driver.get(URL)
+    time.sleep(5)
+
+    page = driver.page_source
+    driver.quit()
+
+    rows = parseBrackets(page)
+    return pd.DataFrame(attachRosters(rows, cache if cache is not None else {}))
 
-    return pd.DataFrame(rows)
+
+def rescrape(URL, cache=None, session=None):
+    """Cheap bracket refresh for watch mode: plain HTTP fetch, no browser."""
+    sess = session or requests.Session()
+    rows = parseBrackets(fetchPage(URL, session=sess))
+    return pd.DataFrame(attachRosters(rows, cache if cache is not None else {}, sess))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 # stats_pipeline.py (patched)
 
-import time
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 
@@ -20,95 +19,207 @@ def _in_window(dateStr, days=RECENT_DAYS):
         return True
     return dt >= datetime.now(timezone.utc) - timedelta(days=days)
 
-def pullReplays(bc, playerID, count=MAX_REPLAYS):
-    data = bc.listReplays(**{
+def _listParams(playerID, count=MAX_REPLAYS):
+    return {
         "player-id": playerID,
         "sort-by": "replay-date",
         "sort-dir": "desc",
         "count": min(200, int(count)),
-    })
+    }
+
+def pullReplays(bc, playerID, count=MAX_REPLAYS, queue=None):
+    params = _listParams(playerID, count)
+    data = queue.fetch(bc, "list", params) if queue else bc.listReplays(**params)
     return data.get("list", []) or []
 
-def replayStats(bc, playerIDs, logs):
-    players = []
-    for pid in set(playerIDs):
-        try:
-            players.extend(pullReplays(bc, pid))
-            time.sleep(0.12)
-        except Exception as e:
-            logs.append(f"List replays failed for {pid}: {e}")
+def _fetchDetail(bc, replayID, queue=None):
+    return queue.fetch(bc, "detail", replayID) if queue else bc.getReplay(replayID)
+
+# Player-level layer: summaries are cached per (player ID, window) so team
+# features can be recomposed from any roster without refetching.
+
+FEAT_KEYS = ["Games"] + AGG_KEYS + ["Shot %"]
+
+class PlayerCache:
+    def __init__(self, queue=None):
+        self.players = {}   # (playerID, days) -> list of per-replay rows
+        self.summaries = {} # (playerID, days) -> summarize(rows), dropped when rows change
+        self.details = {}   # replay id -> replay detail (shared across players)
+        self.queue = queue  # optional FetchQueue for durable, resumable fetches
 
+    def clear(self, playerID=None):
+        if playerID is None:
+            self.players.clear()
+            self.summaries.clear()
+            return
+        for key in [k for k in self.players if k[0] == playerID]:
+            del self.players[key]
+            self.summaries.pop(key, None)
+
+def _plID(pl):
+    pid = pl.get("id") or {}
+    if not pid.get("platform") or not pid.get("id"):
+        return ""
+    return f"{pid['platform']}:{pid['id']}".lower()
+
+def _playerRow(detail, playerID):
+    want = playerID.lower()
+    for side in ("blue", "orange"):
+        team = (detail.get(side) or {})
+        for pl in team.get("players", []) or []:
+            if _plID(pl) != want:
+                continue
+            stats = (pl.get("stats") or {})
+            core  = stats.get("core") or {}
+            demo  = stats.get("demo") or {}
+            return {
+                "Player": pl.get("name") or (pl.get("player") or {}).get("name"),
+                "Goals": core.get("goals", 0),
+                "Shots": core.get("shots", 0),
+                "Saves": core.get("saves", 0),
+                "Demos": demo.get("inflicted", 0),
+                "replay_id": detail.get("id"),
+                "Date": _iso(detail.get("date")),
+            }
+    return None
+
+def getDetail(bc, replayID, cache):
+    if replayID not in cache.details:
+        cache.details[replayID] = _fetchDetail(bc, replayID, cache.queue)
+    return cache.details[replayID]
+
+def _collectRows(bc, playerID, listed, logs, days, cache):
     rows = []
     seen = set()
-    for it in players:
+    for it in listed:
         rid = it.get("id")
         if not rid or rid in seen:
             continue
         seen.add(rid)
+        # list entries carry the date, so skip stale replays before the detail call
+        if it.get("date") and not _in_window(_iso(it["date"]), days):
+            continue
         try:
-            detail = bc.getReplay(rid)
+            detail = getDetail(bc, rid, cache)
         except Exception as e:
             logs.append(f"getReplay {rid} failed: {e}")
             continue
-        date_s = _iso(detail.get("date"))
-        if not _in_window(date_s):
+        if not _in_window(_iso(detail.get("date")), days):
             continue
+        row = _playerRow(detail, playerID)
+        if row:
+            rows.append(row)
+    return rows
 
-        for side in ("blue", "orange"):
-            team = (detail.get(side) or {})
-            for pl in team.get("players", []) or []:
-                name  = pl.get("name") or (pl.get("player") or {}).get("name")
-                stats = (pl.get("stats") or {})
-                core  = stats.get("core") or {}
-                demo  = stats.get("demo") or {}
-                rows.append({
-                    "Player": name,
-                    "Goals": core.get("goals", 0),
-                    "Shots": core.get("shots", 0),
-                    "Saves": core.get("saves", 0),
-                    "Demos": demo.get("inflicted", 0),
-                    "replay_id": detail.get("id"), 
-                    "Date": date_s,
-                })
-    return pd.DataFrame(rows)
-
-def teamFeats(bc, rosterIDs, logs):
-    if not rosterIDs:
-        return pd.Series({k: 0 for k in AGG_KEYS + ["Shot %", "Games"]})
-    dfp = replayStats(bc, rosterIDs, logs)
-    if dfp.empty:
-        return pd.Series({k: 0 for k in AGG_KEYS + ["Shot %", "Games"]})
-
-    perPlayer = dfp.groupby("Player", dropna=False).agg(
-        Games=("replay_id", "nunique"),
-        Goals=("Goals","sum"),
-        Shots=("Shots","sum"),
-        Saves=("Saves","sum"),
-        Demos=("Demos","sum"),
-    ).reset_index()
-
-    totals = perPlayer[["Goals","Shots","Saves","Demos"]].sum()
-    games = perPlayer["Games"].sum()
+QUEUE_CHUNK = 500   # keys per work() call, well under SQLite's bound-parameter limit
+
+def _workKeys(bc, queue, keys, logs):
+    # Only run the tasks this backfill queued; other runs' leftovers in the
+    # shared queue file stay put.
+    keys = list(dict.fromkeys(keys))
+    for i in range(0, len(keys), QUEUE_CHUNK):
+        queue.work(bc, logs, keys=keys[i:i + QUEUE_CHUNK])
+
+def queueReplays(bc, playerIDs, logs, days=RECENT_DAYS, cache=None):
+    # Bulk backfill through cache.queue: every list and in-window detail fetch
+    # is persisted as a task before any runs, so a restart only repeats what
+    # never finished. The stored results are then loaded into the cache.
+    queue = cache.queue
+    todo = [pid for pid in dict.fromkeys(playerIDs) if (pid, days) not in cache.players]
+    if not todo:
+        return
+    _workKeys(bc, queue, [queue.enqueue("list", _listParams(pid)) for pid in todo], logs)
+    details = []
+    for pid in todo:
+        listed = (queue.result("list", _listParams(pid)) or {}).get("list", []) or []
+        for it in listed:
+            rid = it.get("id")
+            if not rid or rid in cache.details:
+                continue
+            if it.get("date") and not _in_window(_iso(it["date"]), days):
+                continue
+            details.append(queue.enqueue("detail", rid))
+    _workKeys(bc, queue, details, logs)
+    for pid in todo:
+        playerRows(bc, pid, logs, days, cache)
+
+def playerRows(bc, playerID, logs, days=RECENT_DAYS, cache=None):
+    cache = cache if cache is not None else PlayerCache()
+    key = (playerID, days)
+    if key in cache.players:
+        return cache.players[key]
+
+    try:
+        listed = pullReplays(bc, playerID, queue=cache.queue)
+    except Exception as e:
+        logs.append(f"List replays failed for {playerID}: {e}")
+        return []
+
+    rows = _collectRows(bc, playerID, listed, logs, days, cache)
+    cache.players[key] = rows
+    return rows
+
+def foldReplays(bc, playerID, listed, logs, days=RECENT_DAYS, cache=None):
+    # Merge newly listed replays into a cached player; returns how many rows were added.
+    cache = cache if cache is not None else PlayerCache()
+    key = (playerID, days)
+    if key not in cache.players:
+        return len(playerRows(bc, playerID, logs, days, cache))
+    rows = cache.players[key]
+    have = {r["replay_id"] for r in rows}
+    new = _collectRows(bc, playerID, [it for it in listed if it.get("id") not in have], logs, days, cache)
+    before = len(rows)
+    rows.extend(new)
+    rows[:] = [r for r in rows if _in_window(r["Date"], days)]
+    if new or len(rows) != before:
+        cache.summaries.pop(key, None)
+    return len(new)
+
+def summarize(rows):
+    totals = {k: int(sum(r[k] or 0 for r in rows)) for k in AGG_KEYS}
+    return pd.Series({
+        "Games": len({r["replay_id"] for r in rows}),
+        **totals,
+        "Shot %": totals["Goals"]/totals["Shots"] if totals["Shots"] else 0.0,
+    }, dtype=object)
+
+def playerSummary(bc, playerID, logs, days=RECENT_DAYS, cache=None):
+    cache = cache if cache is not None else PlayerCache()
+    key = (playerID, days)
+    if key not in cache.summaries:
+        cache.summaries[key] = summarize(playerRows(bc, playerID, logs, days, cache))
+    return cache.summaries[key]
+
+def composeTeam(summaries):
+    summaries = [s for s in summaries if s is not None]
+    if not summaries:
+        return pd.Series({k: 0 for k in FEAT_KEYS})
+    totals = pd.DataFrame(summaries)[["Games"] + AGG_KEYS].sum()
     shot_pct = (totals["Goals"]/totals["Shots"]) if totals["Shots"] else 0.0
-    out = pd.Series({
-        "Games": int(games),
-        "Goals": int(totals["Goals"]),
-        "Shots": int(totals["Shots"]),
-        "Saves": int(totals["Saves"]),
-        "Demos": int(totals["Demos"]),
-        "Shot %": float(shot_pct),
-    })
+    out = pd.Series({k: int(totals[k]) for k in ["Games"] + AGG_KEYS})
+    out["Shot %"] = float(shot_pct)
     return out
 
-def buildFeatRows(bc, matchups, resolve, idMap, logs):
-    t1, t2 = matchups["team1"], matchups["team2"]
+def teamFeats(bc, rosterIDs, logs, days=RECENT_DAYS, cache=None):
+    if not rosterIDs:
+        return pd.Series({k: 0 for k in FEAT_KEYS})
+    cache = cache if cache is not None else PlayerCache()
+    if cache.queue:
+        queueReplays(bc, rosterIDs, logs, days, cache)
+    return composeTeam([playerSummary(bc, pid, logs, days, cache) for pid in dict.fromkeys(rosterIDs)])
+
+def buildFeatRows(bc, matchups, resolve, idMap, logs, cache=None):
     r1, r2 = matchups["team1_players"], matchups["team2_players"] 
     ids1 = resolve(r1, idMap)
     ids2 = resolve(r2, idMap)
 
-    f1 = teamFeats(bc, ids1, logs)
-    f2 = teamFeats(bc, ids2, logs)
+    cache = cache if cache is not None else PlayerCache()
+    f1 = teamFeats(bc, ids1, logs, cache=cache)
+    f2 = teamFeats(bc, ids2, logs, cache=cache)
+    return matchRows(matchups, f1, f2)
 
+def matchRows(matchups, f1, f2):
+    t1, t2 = matchups["team1"], matchups["team2"]
     left = pd.Series({
         "team": t1,
         "opponent": t2,
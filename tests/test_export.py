@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import export
+from stats import PlayerCache, composeTeam, matchRows, summarize, teamFeats
+
+
+MATCHUP = pd.Series({
+    "team1": "Team Falcons", "team2": "Dignitas",
+    "section": "Playoffs", "round": "Semifinals", "best_of": 7,
+})
+
+
+def replay_row(rid, goals, shots):
+    return {"Player": "p", "Goals": goals, "Shots": shots, "Saves": 1, "Demos": 0,
+            "replay_id": rid, "Date": "2026-10-01T00:00:00+00:00"}
+
+
+def feature_frames():
+    # unresolved rosters come back as all-int Series ...
+    empty = teamFeats(None, [], [])
+    # ... while composed summaries upcast to float64
+    full = composeTeam([summarize([replay_row("r1", 3, 5), replay_row("r2", 1, 2)])])
+    assert empty.dtype != full.dtype
+    return pd.DataFrame(list(matchRows(MATCHUP, empty, empty))), pd.DataFrame(list(matchRows(MATCHUP, full, empty)))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_features_with_mixed_dtypes_load_together(tmp_path, fmt):
+    ints, floats = feature_frames()
+    export.writeRows(ints, "features", fmt, root=tmp_path)
+    export.writeRows(floats, "features", "parquet", root=tmp_path)
+
+    df = export.loadRows("features", root=tmp_path)
+    assert len(df) == 4
+    assert str(df["Games"].dtype) == "int64"
+    assert str(df["Shot %"].dtype) == "float64"
+    assert sorted(df["Goals"].tolist()) == [0, 0, 0, 4]
+
+
+def test_predictions_round_trip(tmp_path):
+    _, floats = feature_frames()
+    preds = floats.assign(**{"Team Games": [2, 0], "Goals/G": [2.0, 0.0], "Shots/G": [3.5, 0.0],
+                             "Saves/G": [1.0, 0.0], "Demos/G": [0.0, 0.0], "ts": "2026-10-19T00:00:00Z"})
+    export.writeRows(preds, "predictions", root=tmp_path)
+    export.writeRows(preds.assign(**{"Team Games": [2.0, 0.0]}), "predictions", "arrow", root=tmp_path)
+
+    df = export.loadRows("predictions", root=tmp_path)
+    assert len(df) == 4
+    assert str(df["Team Games"].dtype) == "int64"
+    assert df["Goals/G"].tolist() == [2.0, 0.0, 2.0, 0.0]
+
+
+def test_bracket_rosters_load_as_lists(tmp_path):
+    rows = pd.DataFrame([{
+        "section": "Playoffs", "round": "Final", "best_of": 7,
+        "team1": "Team Falcons", "team2": "Dignitas", "team1_url": None, "team2_url": None,
+        "team1_players": ["Trk511", "Rw9", "Kiileerrz"], "team2_players": [], "finished": False,
+    }])
+    export.writeRows(rows, "bracket", root=tmp_path)
+    export.writeRows(rows.drop(columns=["finished"]), "bracket", "arrow", root=tmp_path)
+
+    df = export.loadRows("bracket", root=tmp_path)
+    assert list(df["team1_players"].iloc[0]) == ["Trk511", "Rw9", "Kiileerrz"]
+    assert list(df["team2_players"].iloc[1]) == []
+
+
+def test_parts_are_append_only(tmp_path):
+    ints, _ = feature_frames()
+    paths = {export.writeRows(ints, "features", root=tmp_path) for _ in range(5)}
+    assert len(paths) == 5
+    assert len(export.loadRows("features", root=tmp_path)) == 10
+
+
+def test_player_frame_from_cache(tmp_path):
+    cache = PlayerCache()
+    cache.players[("steam:1", 90)] = [replay_row("r1", 2, 3)]
+    export.writeRows(export.playerFrame(cache), "players", root=tmp_path)
+    df = export.loadRows("players", root=tmp_path)
+    assert df[["player_id", "days", "Goals"]].values.tolist() == [["steam:1", 90, 2]]
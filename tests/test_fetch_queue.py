@@ -0,0 +1,174 @@
+import time
+
+import pytest
+import requests
+
+from scrapers import fetch_queue
+from scrapers.fetch_queue import FetchQueue
+
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {"Retry-After": retry_after} if retry_after else {}
+
+
+def http_error(code, retry_after=None):
+    return requests.HTTPError(f"HTTP {code}", response=FakeResponse(code, retry_after))
+
+
+class FakeBC:
+    """Serves scripted failures before succeeding; counts every API call."""
+
+    def __init__(self, failures=None):
+        self.failures = {k: list(v) for k, v in (failures or {}).items()}
+        self.calls = []
+
+    def _call(self, key, result):
+        self.calls.append(key)
+        pending = self.failures.get(key)
+        if pending:
+            raise pending.pop(0)
+        return result
+
+    def listReplays(self, **params):
+        return self._call(("list", params["player-id"]), {"list": [{"id": "r1"}]})
+
+    def getReplay(self, rid):
+        return self._call(("detail", rid), {"id": rid})
+
+    def getGroup(self, gid):
+        return self._call(("group", gid), {"replays": []})
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "queue.sqlite"
+
+
+def make(path, **kw):
+    kw.setdefault("baseDelay", 0.001)
+    kw.setdefault("maxDelay", 0.01)
+    return FetchQueue(path, **kw)
+
+
+def test_enqueue_is_idempotent(path):
+    q = make(path)
+    assert q.enqueue("detail", "r1") == q.enqueue("detail", "r1")
+    assert q.counts() == {"pending": 1}
+
+
+def test_detail_result_is_reused_across_reopen(path):
+    bc = FakeBC()
+    assert make(path).fetch(bc, "detail", "r1") == {"id": "r1"}
+    assert make(path).fetch(bc, "detail", "r1") == {"id": "r1"}
+    assert bc.calls == [("detail", "r1")]
+
+
+def test_list_result_expires_after_ttl(path, monkeypatch):
+    bc = FakeBC()
+    params = {"player-id": "steam:1"}
+    q = make(path)
+    q.fetch(bc, "list", params)
+    q.fetch(bc, "list", params)
+    assert len(bc.calls) == 1
+
+    now = time.time()
+    monkeypatch.setattr(fetch_queue.time, "time", lambda: now + fetch_queue.LIST_TTL + 1)
+    make(path).fetch(bc, "list", params)
+    assert len(bc.calls) == 2
+
+
+def test_retryable_errors_back_off_then_succeed(path):
+    bc = FakeBC({("detail", "r1"): [http_error(429), http_error(503), requests.ConnectionError("reset")]})
+    logs = []
+    assert make(path).fetch(bc, "detail", "r1", logs) == {"id": "r1"}
+    assert len(bc.calls) == 4
+    assert len(logs) == 3
+
+
+def test_client_errors_fail_without_retry(path):
+    bc = FakeBC({("detail", "gone"): [http_error(404)]})
+    q = make(path)
+    with pytest.raises(RuntimeError):
+        q.fetch(bc, "detail", "gone")
+    assert q.status("detail", "gone")[0] == "failed"
+    assert len(bc.calls) == 1
+
+    # failed rows stay put on reopen until explicitly retried
+    q = make(path)
+    assert q.status("detail", "gone")[0] == "failed"
+    assert q.retryFailed() == 1
+    assert q.fetch(bc, "detail", "gone") == {"id": "gone"}
+
+
+def test_exhausted_retries_are_requeued_on_reopen(path):
+    bc = FakeBC({("detail", "r1"): [http_error(500)] * 2})
+    q = make(path, maxAttempts=2)
+    with pytest.raises(RuntimeError):
+        q.fetch(bc, "detail", "r1")
+    assert q.status("detail", "r1")[0] == "exhausted"
+
+    q = make(path, maxAttempts=2)
+    assert q.status("detail", "r1")[0] == "pending"
+    assert q.work(bc) == 1
+    assert q.result("detail", "r1") == {"id": "r1"}
+
+
+def test_interrupted_task_resumes(path):
+    class Interrupting(FakeBC):
+        def getReplay(self, rid):
+            if rid == "r2":
+                raise KeyboardInterrupt
+            return super().getReplay(rid)
+
+    q = make(path)
+    for rid in ("r1", "r2", "r3"):
+        q.enqueue("detail", rid)
+    with pytest.raises(KeyboardInterrupt):
+        q.work(Interrupting())
+
+    # simulate a hard crash mid-task as well: row stuck in 'running'
+    q.db.execute("UPDATE tasks SET status = 'running' WHERE key = 'detail:r3'")
+
+    bc = FakeBC()
+    q = make(path)
+    assert q.work(bc) == 2
+    assert sorted(bc.calls) == [("detail", "r2"), ("detail", "r3")]
+    assert q.counts() == {"done": 3}
+
+
+def test_backfill_runs_only_its_own_tasks_and_fills_cache(path):
+    from datetime import datetime, timezone
+    from stats import PlayerCache, RECENT_DAYS, teamFeats
+
+    now = datetime.now(timezone.utc).isoformat()
+
+    class ReplayBC(FakeBC):
+        def listReplays(self, **params):
+            pid = params["player-id"]
+            return self._call(("list", pid), {"list": [{"id": f"r-{pid}", "date": now}]})
+
+        def getReplay(self, rid):
+            platform, pid = rid[2:].split(":")
+            player = {"name": pid, "id": {"platform": platform, "id": pid},
+                      "stats": {"core": {"goals": 1, "shots": 2, "saves": 0}}}
+            return self._call(("detail", rid), {"id": rid, "date": now, "blue": {"players": [player]}})
+
+    q = make(path)
+    # leftover from another tournament, still backing off
+    q.enqueue("detail", "elsewhere")
+    q.db.execute("UPDATE tasks SET next_at = ? WHERE key = 'detail:elsewhere'", (time.time() + 3600,))
+
+    bc = ReplayBC()
+    cache = PlayerCache(q)
+    t0 = time.time()
+    feats = teamFeats(bc, ["steam:1", "steam:2"], [], cache=cache)
+    assert time.time() - t0 < 5
+    assert feats["Goals"] == 2
+    assert set(cache.players) == {("steam:1", RECENT_DAYS), ("steam:2", RECENT_DAYS)}
+    assert q.status("detail", "elsewhere")[0] == "pending"
+    assert len(bc.calls) == 4
+
+    teamFeats(bc, ["steam:1", "steam:2"], [], cache=cache)
+    assert len(bc.calls) == 4
@@ -0,0 +1,136 @@
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import live
+
+
+T0 = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+class Clock(datetime):
+    t = T0
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.t
+
+
+class SilentPublisher:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append(payload)
+
+    def close(self):
+        pass
+
+
+class OutageBC:
+    """Replays are visible to list calls filtered on created-after; lists can be switched off."""
+
+    def __init__(self):
+        self.replays = {}
+        self.down = False
+        self.afters = []
+
+    def upload(self, rid, pid, goals, created):
+        player = {"name": pid, "id": {"platform": "steam", "id": pid},
+                  "stats": {"core": {"goals": goals, "shots": goals + 1, "saves": 0}}}
+        self.replays[rid] = {"id": rid, "date": created.isoformat(), "created": created,
+                             "blue": {"players": [player]}}
+
+    def listReplays(self, **params):
+        if self.down:
+            raise RuntimeError("HTTP 503")
+        after = params.get("created-after")
+        if after:
+            self.afters.append(after)
+            after = datetime.fromisoformat(after.replace("Z", "+00:00"))
+        return {"list": [
+            {"id": rid, "date": d["date"]} for rid, d in self.replays.items()
+            if after is None or d["created"] > after
+        ]}
+
+    def getReplay(self, rid):
+        return self.replays[rid]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    Clock.t = T0
+    monkeypatch.setattr(live, "datetime", Clock)
+    return Clock
+
+
+def make_watcher(bc, publisher=None):
+    matches = pd.DataFrame([{
+        "section": "Playoffs", "round": "Final", "finished": False,
+        "team1": "A", "team2": "B", "team1_players": ["a"], "team2_players": ["b"],
+    }])
+    idMap = {"a": ["steam:a"], "b": ["steam:b"]}
+    resolve = lambda names, m: [pid for n in names for pid in m[n]]
+    return live.Watcher(bc, matches, resolve, idMap, publisher or SilentPublisher())
+
+
+def test_outage_longer_than_skew_keeps_lookback(clock):
+    bc = OutageBC()
+    w = make_watcher(bc)
+    w.prime()
+
+    clock.t = T0 + timedelta(seconds=15)
+    assert w.poll() == 0
+
+    # list calls fail for two minutes; a game is uploaded in the middle
+    bc.down = True
+    bc.upload("g1", "a", 3, T0 + timedelta(seconds=40))
+    for s in range(30, 151, 15):
+        clock.t = T0 + timedelta(seconds=s)
+        w.poll()
+
+    bc.down = False
+    clock.t = T0 + timedelta(seconds=165)
+    assert w.poll() == 1
+    assert w.feats["A"]["Goals"] == 3
+
+
+def test_projection_is_per_team_game(clock):
+    bc = OutageBC()
+    bc.upload("g1", "a", 3, T0 - timedelta(hours=1))
+    pub = SilentPublisher()
+    w = make_watcher(bc, pub)
+    w.prime()
+    row = pub.sent[-1]["rows"][0]
+    assert row["Team Games"] == 1
+    assert row["Goals/G"] == 3.0
+
+
+def test_stalled_socket_client_is_dropped(monkeypatch):
+    monkeypatch.setattr(live, "SEND_TIMEOUT", 0.2)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    pub = live.Publisher(port, stdout=False)
+    stalled = socket.create_connection(("127.0.0.1", port))
+    try:
+        deadline = time.monotonic() + 2
+        while not pub.clients and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pub.clients
+
+        payload = {"blob": "x" * (1 << 20)}
+        t0 = time.monotonic()
+        for _ in range(64):  # far more than the socket buffers hold
+            pub.send(payload)
+            if not pub.clients:
+                break
+        assert not pub.clients
+        assert time.monotonic() - t0 < 5
+    finally:
+        stalled.close()
+        pub.close()